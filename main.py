@@ -1,12 +1,13 @@
 
 import asyncio
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Request
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from src.orchestrators.stock_data_orchestrator import StockDataOrchestrator
 from src.orchestrators.etf_data_orchestrator import ETFDataOrchestrator
 
-from src.controllers.data.historical_data_controller import HistoricalDataController
+from src.controllers.data.historical_data_controller import HistoricalDataController, HistoryPeriod, HistoryRange
 from src.controllers.data.quote_data_controller import QuoteDataController
 from src.controllers.data.time_series_data_controller import TimeSeriesDataController
 
@@ -17,66 +18,144 @@ from src.controllers.data.stocks.financials.ratios_data_controller import Ratios
 
 from src.controllers.data.stocks.statistics.revenue_data_controller import RevenueDataController
 
+from src import container
 from src.async_session_manager import AsyncSessionManager
+from src.errors import RateLimitedError, UpstreamError, ValidationError
+from src.cache.response_cache import cache
+
+# start API and define startup and shutdown processes
+app = FastAPI(default_response_class=ORJSONResponse)
+async def use_eager_tasks():
+    # Tasks run inline until they first suspend, so ones that finish without waiting skip a loop cycle (Python 3.12+)
+    if hasattr(asyncio, 'eager_task_factory'):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
+async def warm_up_session():
+    # Prime DNS and the upstream connection so the first real request skips the handshake
+    await AsyncSessionManager.warm_up(container.qdc.build_url_from_ticker(ticker='SPY', asset_type='e'))
 
-# start API and define shutdown process
-app = FastAPI()
 async def close_session():
     await AsyncSessionManager.close_session()
 
+app.add_event_handler("startup", use_eager_tasks)
+app.add_event_handler("startup", warm_up_session)
 app.add_event_handler("shutdown", close_session)
 
+# -- Error handlers --
+# Typed errors are returned as a stable JSON envelope instead of a generic 500
+def error_response(status_code: int, code: str, exc: Exception) -> ORJSONResponse:
+    return ORJSONResponse(status_code=status_code, content={'ok': False, 'code': code, 'message': str(exc)})
+
+@app.exception_handler(ValidationError)
+async def validation_error_handler(request: Request, exc: ValidationError):
+    return error_response(400, 'validation.error', exc)
+
+@app.exception_handler(RateLimitedError)
+async def rate_limited_error_handler(request: Request, exc: RateLimitedError):
+    return error_response(429, 'upstream.rate_limited', exc)
+
+@app.exception_handler(UpstreamError)
+async def upstream_error_handler(request: Request, exc: UpstreamError):
+    return error_response(502, 'upstream.error', exc)
+
+# -- Dependencies --
+# Every request shares the instances built once in src.container
+# Declared async so FastAPI calls them on the event loop instead of sending each to the thread pool
+async def get_sdo() -> StockDataOrchestrator:
+    return container.stock_orchestrator
+
+async def get_edo() -> ETFDataOrchestrator:
+    return container.etf_orchestrator
+
+async def get_hdc() -> HistoricalDataController:
+    return container.hdc
+
+async def get_qdc() -> QuoteDataController:
+    return container.qdc
+
+async def get_tsdc() -> TimeSeriesDataController:
+    return container.tsdc
+
+async def get_bsdc() -> BalanceSheetDataController:
+    return container.bsdc
+
+async def get_cfdc() -> CashFlowDataController:
+    return container.cfdc
+
+async def get_idc() -> IncomeDataController:
+    return container.idc
+
+async def get_ratios_dc() -> RatiosDataController:
+    return container.ratios_dc
+
+async def get_revenue_dc() -> RevenueDataController:
+    return container.revenue_dc
+
+
 #  -- Stocks routes --
 @app.get("/stocks/{ticker}/data")
-async def stock_data(ticker: str, sdo: StockDataOrchestrator = Depends(StockDataOrchestrator)):
+@cache(expire=300)
+async def stock_data(ticker: str, sdo: StockDataOrchestrator = Depends(get_sdo)):
     return await sdo.compose_stock_data(ticker)
 
 @app.get("/stocks/{ticker}/financials/balance_sheet")
-async def stock_over_time(ticker: str, bsdc: BalanceSheetDataController = Depends(BalanceSheetDataController)):
+@cache(expire=300)
+async def stock_over_time(ticker: str, bsdc: BalanceSheetDataController = Depends(get_bsdc)):
     return await bsdc.get_balance_sheet_data(ticker)
 
 @app.get("/stocks/{ticker}/financials/cash_flow")
-async def stock_over_time(ticker: str, cfdc: CashFlowDataController = Depends(CashFlowDataController)):
+@cache(expire=300)
+async def stock_over_time(ticker: str, cfdc: CashFlowDataController = Depends(get_cfdc)):
     return await cfdc.get_cash_flow_data(ticker)
 
 @app.get("/stocks/{ticker}/financials/income")
-async def stock_over_time(ticker: str, period: str = 'quarterly', idc: IncomeDataController = Depends(IncomeDataController)):
+@cache(expire=300)
+async def stock_over_time(ticker: str, period: str = 'quarterly', idc: IncomeDataController = Depends(get_idc)):
     return await idc.get_income_data(ticker, period)
 
 @app.get("/stocks/{ticker}/financials/ratios")
-async def stock_over_time(ticker: str, rdc: RatiosDataController = Depends(RatiosDataController)):
+@cache(expire=300)
+async def stock_over_time(ticker: str, rdc: RatiosDataController = Depends(get_ratios_dc)):
     return await rdc.get_ratios_data(ticker)
 
 @app.get("/stocks/{ticker}/history")
-async def stock_history(ticker: str, range: str = '1Y', period: str = 'Daily', hdc: HistoricalDataController = Depends(HistoricalDataController)):
-    return await hdc.get_asset_historical_data(ticker, 's', range, period)
+@cache(expire=300)
+async def stock_history(ticker: str, range: HistoryRange = HistoryRange.one_year, period: HistoryPeriod = HistoryPeriod.daily, hdc: HistoricalDataController = Depends(get_hdc)):
+    return await hdc.get_asset_historical_data(ticker, 's', range.value, period.value)
 
 @app.get("/stocks/{ticker}/over_time")
-async def stock_over_time(ticker: str, tsdc: TimeSeriesDataController = Depends(TimeSeriesDataController)):
+@cache(expire=300)
+async def stock_over_time(ticker: str, tsdc: TimeSeriesDataController = Depends(get_tsdc)):
     return await tsdc.get_asset_ts_data(ticker, 's')
 
 @app.get("/stocks/{ticker}/quote")
-async def etf_over_time(ticker: str, qdc: QuoteDataController = Depends(QuoteDataController)):
+@cache(expire=5)
+async def etf_over_time(ticker: str, qdc: QuoteDataController = Depends(get_qdc)):
     return await qdc.get_asset_quote_data(ticker, 's')
 
 @app.get("/stocks/{ticker}/statistics/revenue")
-async def stock_over_time(ticker: str, rdc: RevenueDataController = Depends(RevenueDataController)):
+@cache(expire=300)
+async def stock_over_time(ticker: str, rdc: RevenueDataController = Depends(get_revenue_dc)):
     return await rdc.get_revenue_data(ticker)
 
 
 # -- ETFs routes ---
 @app.get("/etfs/{ticker}/data")
-async def etf_data(ticker: str, edo: ETFDataOrchestrator = Depends(ETFDataOrchestrator)):
+@cache(expire=300)
+async def etf_data(ticker: str, edo: ETFDataOrchestrator = Depends(get_edo)):
     return await edo.compose_etf_data(ticker)
 
 @app.get("/etfs/{ticker}/history")
-async def etf_history(ticker: str, range: str = '1Y', period: str = 'Daily', hdc: HistoricalDataController = Depends(HistoricalDataController)):
-    return await hdc.get_asset_historical_data(ticker, 'e', range, period)
+@cache(expire=300)
+async def etf_history(ticker: str, range: HistoryRange = HistoryRange.one_year, period: HistoryPeriod = HistoryPeriod.daily, hdc: HistoricalDataController = Depends(get_hdc)):
+    return await hdc.get_asset_historical_data(ticker, 'e', range.value, period.value)
 
 @app.get("/etfs/{ticker}/over_time")
-async def etf_over_time(ticker: str, tsdc: TimeSeriesDataController = Depends(TimeSeriesDataController)):
+@cache(expire=300)
+async def etf_over_time(ticker: str, tsdc: TimeSeriesDataController = Depends(get_tsdc)):
     return await tsdc.get_asset_ts_data(ticker, 'e')
 
 @app.get("/etfs/{ticker}/quote")
-async def etf_over_time(ticker: str, qdc: QuoteDataController = Depends(QuoteDataController)):
+@cache(expire=5)
+async def etf_over_time(ticker: str, qdc: QuoteDataController = Depends(get_qdc)):
     return await qdc.get_asset_quote_data(ticker, 'e')
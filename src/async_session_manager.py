@@ -1,51 +1,222 @@
 import asyncio
-import aiohttp
+import logging
+import os
+import random
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import httpx
+import orjson
+
+from src.cache.response_cache import upstream_cache
+from src.errors import RateLimitedError, UpstreamClientError, UpstreamServerError
+
+log = logging.getLogger(__name__)
 
 class AsyncSessionManager:
     _session = None
-    _semaphore = asyncio.Semaphore(2)  # Limit to 2 concurrent requests
-    
+    host_concurrency = int(os.getenv("HTTP_CONCURRENCY", "8"))  # Concurrent requests allowed to each host
+    _semaphores = {}  # Limits concurrent requests to each host, keyed by host and created on first use
+    _inflight = {}  # Tasks for requests in progress, keyed by url
+    _waiters = {}  # Callers still waiting on each in-flight task
+    _warm_up_task = None  # Kept so the background warm up request is not garbage collected
+    _connection_limit = 200
+    _keepalive_connection_limit = 50
+    _keepalive_expiry = 60  # seconds an idle connection stays open, httpx closes them after 5 by default
+    _timeout = 30.0  # seconds, large statement payloads can be slow to arrive
+
+    @classmethod
+    def _get_semaphore(cls, host):
+        # Created lazily so it binds to the event loop serving requests, not the one active at import
+        semaphore = cls._semaphores.get(host)
+        if semaphore is None:
+            semaphore = cls._semaphores[host] = asyncio.Semaphore(cls.host_concurrency)
+        return semaphore
+
     @classmethod
     async def get_session(cls):
-        if cls._session is None or cls._session.closed:
-            print("Starting async session...\n")
-            cls._session = aiohttp.ClientSession()
+        if cls._session is None or cls._session.is_closed:
+            log.info("Starting async session...")
+            cls._session = httpx.AsyncClient(
+                http2=True,  # multiplex concurrent requests to the same host over one connection
+                limits=httpx.Limits(
+                    max_connections=cls._connection_limit,
+                    max_keepalive_connections=cls._keepalive_connection_limit,
+                    keepalive_expiry=cls._keepalive_expiry,
+                ),
+                timeout=cls._timeout,
+                # Compressed responses are much smaller on the wire; br needs the Brotli package
+                headers={'Accept-Encoding': 'gzip, br'},
+                # Cookies are never needed, so reject them instead of storing them
+                cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+            )
         return cls._session
 
+    @classmethod
+    async def warm_up(cls, url):
+        '''
+            Creates the session on the running event loop and starts one request in the background
+            to open a pooled connection to the url's host. Returns without waiting for the request,
+            so a slow or unreachable host does not hold up startup.
+
+            Arguments:
+                url (str) URL on the host to connect to
+        '''
+
+        await cls.get_session()
+        cls._warm_up_task = asyncio.create_task(cls._warm_up_request(url))
+
+    @classmethod
+    async def _warm_up_request(cls, url):
+        # Failures are only reported, the first real request will connect again
+        try:
+            await cls.request_with_limit(url, max_retries=0)
+        except Exception as e:
+            log.warning("Warm up request failed: %r", e)
+
     @classmethod
     async def close_session(cls):
+        if cls._warm_up_task is not None:
+            cls._warm_up_task.cancel()
+            cls._warm_up_task = None
+
+        # Stop requests still in flight so none of them opens a new session after this one closes
+        tasks = list(cls._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
         if cls._session:
-            print("\nClosing async session...")
-            await cls._session.close()
+            log.info("Closing async session...")
+            await cls._session.aclose()
             cls._session = None
-    
-    @classmethod
-    async def request_with_limit(cls, url, retries=0):
-        async with cls._semaphore:
-            session = await cls.get_session()
-            if session:
-                async with session.get(url) as response:
-                    if response.status == 200:                             
-                        session.cookie_jar.clear()
-                        
-                        # Return JSON response if successful
-                        return await response.json()
-                    
-                    # Check for rate limiting (HTTP 429)
-                    if response.status == 429 and retries < 1:
-                        retries = retries + 1
-                        retry_after = int(response.headers.get("Retry-After", 5))
-                        print(f"Rate limited. Retries left: {retries}. Retrying after {retry_after} seconds...")
-                        
-                        # Close and recycle the session if rate limited
-                        session.cookie_jar.clear()
-                        await cls.close_session()
-                        
-                        # Wait before retrying
-                        await asyncio.sleep(retry_after)
-                        
-                        # Retry the request with a new session
-                        return await cls.request_with_limit(url, retries)
-                    else:
-                        raise BaseException({'message': 'Request error.', 'status': response.status, 'reason': response.reason})
-           
+
+    @classmethod
+    async def request_with_limit(cls, url, max_retries=4, base_delay=1.0, cap=30.0, cache_expire=None):
+        '''
+            Requests JSON from a url. Concurrent calls for the same url share one upstream
+            request instead of each making their own.
+
+            Arguments:
+                url (str) URL for data
+                max_retries (int) Retries allowed after a 429 response
+                base_delay (float) Backoff delay in seconds for the first retry
+                cap (float) Maximum delay in seconds between retries
+                cache_expire (float) Seconds to reuse the response body for this url, None to always request
+
+            Returns:
+                response_json (dict)
+        '''
+
+        if cache_expire:
+            content = upstream_cache.get(url)
+            if content is not None:
+                return orjson.loads(content)
+
+        # The fetch runs in its own task shared by every caller of the same url. Each caller,
+        # including the one that started it, waits through a shield, so cancelling one caller
+        # never cancels the request for the others.
+        task = cls._inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(cls._fetch(url, max_retries, base_delay, cap, cache_expire))
+            cls._inflight[url] = task
+
+            def forget(done):
+                if cls._inflight.get(url) is done:
+                    del cls._inflight[url]
+
+            task.add_done_callback(forget)
+
+        cls._waiters[task] = cls._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            cls._waiters[task] -= 1
+            if not cls._waiters[task]:
+                del cls._waiters[task]
+                # The last caller left before the result arrived, so stop the fetch and its retries
+                if not task.done():
+                    task.cancel()
+                    if cls._inflight.get(url) is task:
+                        del cls._inflight[url]
+
+    @classmethod
+    async def _fetch(cls, url, max_retries, base_delay, cap, cache_expire):
+        '''
+            Requests and decodes the JSON for a url, caching the raw body when cache_expire is set
+            and the body decoded.
+
+            Arguments:
+                url (str) URL for data
+                max_retries (int) Retries allowed after a 429 response
+                base_delay (float) Backoff delay in seconds for the first retry
+                cap (float) Maximum delay in seconds between retries
+                cache_expire (float) Seconds to reuse the response body for this url, None to not cache it
+
+            Returns:
+                response_json (dict)
+        '''
+
+        content = await cls._request(url, max_retries, base_delay, cap)
+        try:
+            response_json = orjson.loads(content)
+        except orjson.JSONDecodeError as e:
+            # A 200 that is not JSON, e.g. a challenge page, is an upstream failure and is never cached
+            raise UpstreamServerError('Response was not valid JSON.', url=url, status=200) from e
+
+        # Cache the raw body rather than the parsed JSON so each cache hit decodes its own copy
+        if cache_expire:
+            upstream_cache.set(url, content, cache_expire)
+
+        return response_json
+
+    @classmethod
+    async def _request(cls, url, max_retries, base_delay, cap):
+        '''
+            Requests the body of a url. Rate limited (HTTP 429) responses are retried with
+            exponential backoff and jitter, honoring Retry-After when the server sends it.
+
+            Arguments:
+                url (str) URL for data
+                max_retries (int) Retries allowed after a 429 response
+                base_delay (float) Backoff delay in seconds for the first retry
+                cap (float) Maximum delay in seconds between retries
+
+            Returns:
+                content (bytes)
+        '''
+
+        # Each host gets its own limit, so a burst to one host does not hold up requests to another
+        semaphore = cls._get_semaphore(urlsplit(url).netloc)
+
+        for attempt in range(max_retries + 1):
+            async with semaphore:
+                session = await cls.get_session()
+                try:
+                    response = await session.get(url)
+                except httpx.TransportError as e:
+                    # Timeouts and connection failures are upstream failures too, keep them typed
+                    raise UpstreamServerError(f'Request failed: {e!r}', url=url) from e
+
+            if response.status_code == 200:
+                return response.content
+
+            if response.status_code != 429:
+                error = UpstreamServerError if response.status_code >= 500 else UpstreamClientError
+                raise error('Request error.', url=url, status=response.status_code, reason=response.reason_phrase)
+
+            if attempt == max_retries:
+                break
+
+            # Exponential backoff with jitter, unless the server says how long to wait
+            delay = min(cap, base_delay * (2 ** attempt)) * (0.5 + random.random() * 0.5)
+            retry_after = response.headers.get("Retry-After")
+            if retry_after is not None and retry_after.isdigit():
+                delay = min(cap, float(retry_after))
+
+            log.warning("Rate limited. Attempt %d of %d. Retrying after %.2f seconds...", attempt + 1, max_retries + 1, delay)
+
+            # Wait before retrying, outside the semaphore so other requests can proceed
+            await asyncio.sleep(delay)
+
+        raise RateLimitedError('Rate limited after all retries.', url=url, status=429, reason='Too Many Requests')
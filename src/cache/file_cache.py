@@ -0,0 +1,68 @@
+
+# imports
+import hashlib
+import logging
+import os
+import time
+from typing import Any
+
+import orjson
+
+
+log = logging.getLogger(__name__)
+
+cache_dir = os.getenv('FILE_CACHE_DIR', '.cache')
+
+
+def _path(endpoint: str, url: str) -> str:
+    return os.path.join(cache_dir, endpoint, hashlib.md5(url.encode()).hexdigest() + '.json')
+
+
+def get(endpoint: str, url: str, default: Any = None) -> Any:
+    '''
+        Gets the payload cached on disk for a url if it has not expired.
+
+        Arguments:
+            endpoint (str) Folder the endpoint's entries are kept in
+            url (str) URL the payload was requested from
+            default (Any) Value returned on a miss
+
+        Returns:
+            payload (Any)
+    '''
+
+    try:
+        with open(_path(endpoint, url), 'rb') as file:
+            entry = orjson.loads(file.read())
+    except (OSError, orjson.JSONDecodeError):
+        return default
+
+    if time.time() - entry['ts'] >= entry['ttl']:
+        return default
+
+    return entry['payload']
+
+
+def set(endpoint: str, url: str, payload: Any, ttl: float) -> None:
+    '''
+        Caches a payload on disk for 'ttl' seconds. A failed write is reported but not raised.
+
+        Arguments:
+            endpoint (str) Folder the endpoint's entries are kept in
+            url (str) URL the payload was requested from
+            payload (Any) JSON serializable value to cache
+            ttl (float) Seconds until the entry expires
+    '''
+
+    path = _path(endpoint, url)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, 'wb') as file:
+            file.write(orjson.dumps({'ts': time.time(), 'ttl': ttl, 'payload': payload}))
+
+        # Swap the finished file in so readers never see a partial write
+        os.replace(temp_path, path)
+    except OSError as e:
+        log.warning("File cache write failed: %r", e)
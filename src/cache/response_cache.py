@@ -0,0 +1,111 @@
+
+# imports
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    '''
+        Bounded in-memory cache whose entries expire after a number of seconds. When maxbytes
+        is set, values must support len() and the cache also holds at most that many bytes.
+    '''
+
+    def __init__(self, maxsize: int = 1024, maxbytes: int = None) -> None:
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        '''
+            Gets a cached value if it has not expired.
+
+            Arguments:
+                key (Hashable) Cache key
+                default (Any) Value returned on a miss
+
+            Returns:
+                value (Any)
+        '''
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._discard(key)
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, expire: float) -> None:
+        '''
+            Caches a value for 'expire' seconds, evicting the least recently used entries when full.
+            A value larger than maxbytes is not cached.
+
+            Arguments:
+                key (Hashable) Cache key
+                value (Any) Value to cache
+                expire (float) Seconds until the entry expires
+        '''
+
+        self._discard(key)
+        if self.maxbytes is not None:
+            if len(value) > self.maxbytes:
+                return
+            self._bytes += len(value)
+
+        self._entries[key] = (time.monotonic() + expire, value)
+
+        while len(self._entries) > self.maxsize or (self.maxbytes is not None and self._bytes > self.maxbytes):
+            self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None and self.maxbytes is not None:
+            self._bytes -= len(entry[1])
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+
+response_cache = TTLCache(maxsize=1024)
+upstream_cache = TTLCache(maxsize=1024, maxbytes=64 * 1024 * 1024)  # Raw upstream response bodies keyed by url, at most 64 MB
+
+
+def cache(expire: float):
+    '''
+        Caches the result of an async route for 'expire' seconds.
+
+        The key is the route function plus its path and query parameters. Dependencies injected
+        with Depends are left out of the key since they are not part of the request.
+
+        Arguments:
+            expire (float) Seconds a response stays cached
+    '''
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (func, tuple((name, value) for name, value in kwargs.items() if isinstance(value, (str, int, float, bool))))
+
+            cached = response_cache.get(key, _MISSING)
+            if cached is not _MISSING:
+                return cached
+
+            result = await func(*args, **kwargs)
+            response_cache.set(key, result, expire)
+
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,43 @@
+
+# Builds every controller and orchestrator exactly once per process.
+# Controllers are stateless, so the API and both orchestrators share these instances.
+
+# imports
+from src.orchestrators.stock_data_orchestrator import StockDataOrchestrator
+from src.orchestrators.etf_data_orchestrator import ETFDataOrchestrator
+
+from src.controllers.data.historical_data_controller import HistoricalDataController
+from src.controllers.data.quote_data_controller import QuoteDataController
+from src.controllers.data.time_series_data_controller import TimeSeriesDataController
+
+from src.controllers.data.stocks.financials.balance_sheet_data_controller import BalanceSheetDataController
+from src.controllers.data.stocks.financials.cash_flow_data_controller import CashFlowDataController
+from src.controllers.data.stocks.financials.income_data_controller import IncomeDataController
+from src.controllers.data.stocks.financials.ratios_data_controller import RatiosDataController
+
+from src.controllers.data.stocks.statistics.revenue_data_controller import RevenueDataController
+
+
+# -- Controllers --
+hdc = HistoricalDataController()
+qdc = QuoteDataController()
+tsdc = TimeSeriesDataController()
+
+bsdc = BalanceSheetDataController()
+cfdc = CashFlowDataController()
+idc = IncomeDataController()
+ratios_dc = RatiosDataController()
+
+revenue_dc = RevenueDataController()
+
+# -- Orchestrators --
+stock_orchestrator = StockDataOrchestrator(
+    bsdc=bsdc,
+    cdc=cfdc,
+    idc=idc,
+    hdc=hdc,
+    ratios_dc=ratios_dc,
+    revenue_dc=revenue_dc,
+    tsdc=tsdc,
+)
+etf_orchestrator = ETFDataOrchestrator(hdc=hdc, tsdc=tsdc)
@@ -1,36 +1,43 @@
 
 # imports
-from asyncio import CancelledError, TimeoutError, create_task, Task
+from enum import Enum
 
-from  src.async_session_manager import AsyncSessionManager
+from src.async_session_manager import AsyncSessionManager
+from src.errors import ValidationError
+
+
+class HistoryRange(str, Enum):
+    '''Length of time to go back for historical data'''
+    three_months = '3M'
+    six_months = '6M'
+    year_to_date = 'YTD'
+    one_year = '1Y'
+    five_years = '5Y'
+    ten_years = '10Y'
+    max = 'Max'
+
+
+class HistoryPeriod(str, Enum):
+    '''Interval of time for historical data rows'''
+    daily = 'Daily'
+    weekly = 'Weekly'
+    monthly = 'Monthly'
+    quarterly = 'Quarterly'
+    annual = 'Annual'
 
 
 class HistoricalDataController:
     '''Handles retrieving and formatting historical data'''
     base_url = 'https://api.stockanalysis.com/api/symbol/{asset_type}/{ticker}/history?range={range}&period={period}'
 
-    valid_asset_types = [
+    valid_asset_types = frozenset({
         's',  # stock
         'e',  # etf
-    ]
-
-    valid_periods = [
-        'Daily',
-        'Weekly',
-        'Monthly',
-        'Quarterly',
-        'Annual'
-    ]
-
-    valid_ranges = [
-        '3M',
-        '6M',
-        'YTD',
-        '1Y',
-        '5Y',
-        '10Y',
-        'Max'
-    ]
+    })
+
+    valid_periods = frozenset(period.value for period in HistoryPeriod)
+
+    valid_ranges = frozenset(range.value for range in HistoryRange)
 
     json_to_label_map = {
         "t": "date",
@@ -43,7 +50,7 @@ class HistoricalDataController:
         "ch": "price_change"
     }
 
-    async def get_asset_historical_data(self, ticker: str, asset_type: str, range: str, period: str):
+    async def get_asset_historical_data(self, ticker: str, asset_type: str, range: str, period: str, wrap: bool = True):
         '''
             Gets a list of historical data for an asset.
 
@@ -52,6 +59,7 @@ class HistoricalDataController:
                 asset_type (str) Type of asset (e.g., e ('ETF'), s ('Stock'))
                 range (str) Length of time to go back
                 period (str) Interval of time for row data  (e.g., Daily, Weekly, Monthly)
+                wrap (bool) Wrap the data with its data_type, pass False to get the data alone
 
             Returns:
                 historical_data (List)
@@ -59,7 +67,7 @@ class HistoricalDataController:
 
         # validate arguments
         if not self.validate_historical_parameters(ticker=ticker, asset_type=asset_type, range=range, period=period):
-            raise BaseException('Invalid historical parameters for asset data.')
+            raise ValidationError('Invalid historical parameters for asset data.')
 
         # build url
         url = self.build_url_from_ticker(
@@ -70,24 +78,16 @@ class HistoricalDataController:
         )
 
         # get data
-        data = create_task(self.get_historical_data_from_url(url))
-        if not await data:
-            return {
-                'data_type': 'historical',
-                'data': data
-            }
-
-        # format data
-        formatted_data = [self.convert_keys_to_labels(entry) for entry in await data if data != None]
-
-        if formatted_data is not None:
-            # return data
-            return {
-                'data_type': 'historical',
-                'data': formatted_data
-            }
-        else:
-            raise f'Formatted_data is none'
+        data = await self.get_historical_data_from_url(url)
+
+        # return data, keys were relabeled while the response was decoded
+        if not wrap:
+            return data
+
+        return {
+            'data_type': 'historical',
+            'data': data
+        }
 
     def build_url_from_ticker(self, ticker: str, asset_type: str, range: str, period: str):
         '''
@@ -104,16 +104,10 @@ class HistoricalDataController:
 
         # check args
         if not ticker or not asset_type or not range or not period:
-            raise f'Invalid arguments for {__name__}'
+            raise ValidationError(f'Invalid arguments for {__name__}')
 
         # build url
-        url = self.base_url
-        url = url.replace('{ticker}', ticker)
-        url = url.replace('{asset_type}', asset_type)
-        url = url.replace('{range}', range)
-        url = url.replace('{period}', period)
-
-        return url
+        return self.base_url.format(asset_type=asset_type, ticker=ticker, range=range, period=period)
 
     def convert_keys_to_labels(self, entry):
         '''
@@ -126,7 +120,8 @@ class HistoricalDataController:
             converted_item (dict)
         '''
 
-        return {self.json_to_label_map.get(key, key): value for key, value in entry.items()}
+        get_label = self.json_to_label_map.get
+        return {get_label(key, key): value for key, value in entry.items()}
 
     async def get_historical_data_from_url(self, url):
         '''
@@ -146,7 +141,13 @@ class HistoricalDataController:
             return json_data
             
         # Could get 'news' or  'data'
-        return json_data.get('data')
+        rows = json_data.get('data')
+        if not rows:
+            return rows
+
+        # Relabel inline with the lookup bound once, a method call per row costs more than the relabel
+        get_label = self.json_to_label_map.get
+        return [{get_label(key, key): value for key, value in row.items()} for row in rows]
 
     def validate_historical_parameters(self, ticker: str, asset_type: str, range: str, period: str):
         '''
@@ -163,16 +164,16 @@ class HistoricalDataController:
 
         # check args
         if not ticker or not asset_type or not range or not period:
-            raise BaseException(f'Invalid arguments for {__name__}')
+            raise ValidationError(f'Invalid arguments for {__name__}')
 
         # validate parameters
         if asset_type not in self.valid_asset_types:
-            raise BaseException(
+            raise ValidationError(
                 f'Asset type parameter value {asset_type} is not valid.')
         if range not in self.valid_ranges:
-            raise BaseException(f'Range parameter value {range} is not valid.')
+            raise ValidationError(f'Range parameter value {range} is not valid.')
         if period not in self.valid_periods:
-            raise BaseException(
+            raise ValidationError(
                 f'Period parameter value {period} is not valid.')
 
         return True
@@ -1,16 +1,16 @@
 # imports
-from asyncio import CancelledError, TimeoutError, create_task
 from typing import Dict, List, Optional, Any
 
-from src.async_session_manager import AsyncSessionManager
+from src.controllers.data.stocks.financials.financials_data_controller import FinancialsDataController
 
 
-class BalanceSheetDataController:
+class BalanceSheetDataController(FinancialsDataController):
     '''Handles retrieving and formatting balance_sheet financial data'''
 
-    balance_sheet_base_url = 'https://stockanalysis.com/stocks/{ticker}/financials/__data.json?x-sveltekit-trailing-slash=1&x-sveltekit-invalidated=001'
+    data_type = 'balance_sheet'
+    base_url = 'https://stockanalysis.com/stocks/{ticker}/financials/__data.json?x-sveltekit-trailing-slash=1&x-sveltekit-invalidated=001'
 
-    balance_sheet_keys_to_labels = {
+    keys_to_labels = {
         "datekey": "date_of_financial_data",
         "fiscalYear": "fiscal_year",
         "fiscalQuarter": "fiscal_quarter",
@@ -54,119 +54,15 @@ class BalanceSheetDataController:
         "payoutratio": "dividend_payout_ratio"
     }
 
-    async def get_balance_sheet_data(self, stock_ticker: str) -> Optional[List[Dict[str, Any]]]:
+    async def get_balance_sheet_data(self, stock_ticker: str, wrap: bool = True) -> Optional[List[Dict[str, Any]]]:
         '''
-        Gets balance_sheet data for a stock.
+        Gets balance sheet data for a stock.
 
         Arguments:
             stock_ticker (str): Stock ticker.
+            wrap (bool): Wrap the data with its data_type, pass False to get the data alone.
 
         Returns:
-            Optional[List[Dict[str, Any]]]: Cash flow data or None if not found.
+            Optional[List[Dict[str, Any]]]: Balance sheet data.
         '''
-        if not stock_ticker:
-            raise BaseException('No stock ticker provided for cash flow data.')
-
-        url = self.build_balance_sheet_url(stock_ticker)
-
-        data = create_task(self.fetch_balance_sheet_data(url))
-
-        if data:
-            return {
-                'data_type': 'balance_sheet',
-                'data': await data
-            }
-        else:
-            raise BaseException(f'balance sheet data is none')
-
-    def build_balance_sheet_url(self, ticker: str) -> str:
-        '''
-        Builds URL for balance_sheet data using the given ticker.
-
-        Arguments:
-            ticker (str): Stock ticker.
-
-        Returns:
-            str: Constructed URL.
-        '''
-        return self.balance_sheet_base_url.replace('{ticker}', ticker)
-
-    def convert_keys_to_labels(self, entry: Dict[str, Any]) -> Dict[str, Any]:
-        '''
-        Relabels keys in a dictionary according to the financial_balance_sheet_keys_to_labels mapping.
-
-        Arguments:
-            entry (Dict[str, Any]): Dictionary of financial data.
-
-        Returns:
-            Dict[str, Any]: Dictionary with relabeled keys.
-        '''
-        return {self.balance_sheet_keys_to_labels.get(key, key): value for key, value in entry.items()}
-
-    async def fetch_balance_sheet_data(self, url: str) -> Optional[List[Dict[str, Any]]]:
-        '''
-        Handles retrieval of cash flow data from a URL.
-
-        Arguments:
-            url (str): URL for data.
-
-        Returns:
-            Optional[List[Dict[str, Any]]]: Formatted data or None if not found.
-        '''
-        response_json = await AsyncSessionManager.request_with_limit(url)
-        if not response_json:
-            raise f'No json for balance_sheet data.'
-
-        return self.extract_financial_data(response_json)
-
-    def extract_financial_data(self, response_json: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
-        '''
-        Extracts financial data from the response JSON.
-
-        Arguments:
-            response_json (Dict[str, Any]): JSON response from the data request.
-
-        Returns:
-            Optional[List[Dict[str, Any]]]: Extracted financial data or None if not found.
-        '''
-        nodes = response_json.get('nodes')
-        if not nodes or len(nodes) < 3:
-            raise BaseException('Target node does not exist.')
-
-        target_node = nodes[2]
-        data = target_node.get('data')
-        if not data:
-            raise BaseException('No data was found in the target node.')
-
-        financial_data_indices = self.get_financial_data_indices(data)
-        if financial_data_indices is None:
-            raise BaseException('Could not find target index node.')
-
-        financial_data = {
-            key: [data[target_index] for target_index in indices] for key, indices in financial_data_indices.items()
-        }
-
-        # Format the keys to labels
-        formatted_data = [self.convert_keys_to_labels(financial_data)]
-        
-        return formatted_data
-
-    def get_financial_data_indices(self, data: List[Dict[str, Any]]) -> Optional[Dict[str, List[int]]]:
-        '''
-        Extracts indices for financial data from the provided data.
-
-        Arguments:
-            data (List[Dict[str, Any]]): The raw data list.
-
-        Returns:
-            Optional[Dict[str, List[int]]]: Mapping of financial keys to their indices.
-        '''
-        financial_glossary_index = data[0].get('financialData')
-        if financial_glossary_index is None:
-            raise BaseException('No index for financialData was found.')
-
-        financial_glossary_object = data[financial_glossary_index]
-        if not financial_glossary_object:
-            raise BaseException('No object existed at financialData index.')
-
-        return {key: data[target_index] for key, target_index in financial_glossary_object.items()}
+        return await self.get_financial_data(stock_ticker, wrap)
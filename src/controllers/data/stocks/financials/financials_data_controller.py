@@ -0,0 +1,135 @@
+# imports
+from operator import itemgetter
+from typing import Dict, List, Optional, Any
+
+from src.async_session_manager import AsyncSessionManager
+from src.errors import EmptyResponseError, UpstreamError, ValidationError
+
+
+class FinancialsDataController:
+    '''
+    Handles retrieving and formatting financial statement data. Subclasses set the
+    data_type, the base_url to request and the keys_to_labels mapping for their statement.
+    '''
+
+    data_type: str = ''
+    base_url: str = ''
+    keys_to_labels: Dict[str, str] = {}
+
+    # Statements only change when a company reports, so responses are reused for 6 hours
+    cache_expire: int = 6 * 60 * 60
+
+    async def get_financial_data(self, stock_ticker: str, wrap: bool = True, **url_params: str) -> Optional[List[Dict[str, Any]]]:
+        '''
+        Gets financial data for a stock.
+
+        Arguments:
+            stock_ticker (str): Stock ticker.
+            wrap (bool): Wrap the data with its data_type, pass False to get the data alone.
+            url_params (str): Values for any other placeholders in base_url.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Financial data.
+        '''
+        if not stock_ticker:
+            raise ValidationError(f'No stock ticker provided for {self.data_type} data.')
+
+        url = self.build_url(stock_ticker, **url_params)
+
+        data = await self.fetch_financial_data(url)
+        if data is None:
+            raise UpstreamError(f'{self.data_type} data is none.')
+
+        if not wrap:
+            return data
+
+        return {
+            'data_type': self.data_type,
+            'data': data
+        }
+
+    def build_url(self, ticker: str, **url_params: str) -> str:
+        '''
+        Builds URL for financial data using the given ticker.
+
+        Arguments:
+            ticker (str): Stock ticker.
+            url_params (str): Values for any other placeholders in base_url.
+
+        Returns:
+            str: Constructed URL.
+        '''
+        return self.base_url.format(ticker=ticker, **url_params)
+
+    async def fetch_financial_data(self, url: str) -> Optional[List[Dict[str, Any]]]:
+        '''
+        Handles retrieval of financial data from a URL.
+
+        Arguments:
+            url (str): URL for data.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Formatted data or None if not found.
+        '''
+        response_json = await AsyncSessionManager.request_with_limit(url, cache_expire=self.cache_expire)
+        if not response_json:
+            raise EmptyResponseError(f'No json for {self.data_type} data.', url=url)
+
+        return self.extract_financial_data(response_json)
+
+    def extract_financial_data(self, response_json: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        '''
+        Extracts financial data from the response JSON.
+
+        Arguments:
+            response_json (Dict[str, Any]): JSON response from the data request.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Extracted financial data or None if not found.
+        '''
+        nodes = response_json.get('nodes')
+        if not nodes or len(nodes) < 3:
+            raise UpstreamError('Target node does not exist.')
+
+        target_node = nodes[2]
+        data = target_node.get('data')
+        if not data:
+            raise UpstreamError('No data was found in the target node.')
+
+        financial_data_indices = self.get_financial_data_indices(data)
+        if financial_data_indices is None:
+            raise UpstreamError('Could not find target index node.')
+
+        # Label the keys while building the data instead of copying it into a relabeled dict
+        get_label = self.keys_to_labels.get
+        financial_data = {}
+        for key, indices in financial_data_indices.items():
+            # itemgetter gathers a column in one C call, but returns a bare value for a single index
+            if len(indices) > 1:
+                values = list(itemgetter(*indices)(data))
+            else:
+                values = [data[target_index] for target_index in indices]
+
+            financial_data[get_label(key, key)] = values
+
+        return [financial_data]
+
+    def get_financial_data_indices(self, data: List[Dict[str, Any]]) -> Optional[Dict[str, List[int]]]:
+        '''
+        Extracts indices for financial data from the provided data.
+
+        Arguments:
+            data (List[Dict[str, Any]]): The raw data list.
+
+        Returns:
+            Optional[Dict[str, List[int]]]: Mapping of financial keys to their indices.
+        '''
+        financial_glossary_index = data[0].get('financialData')
+        if financial_glossary_index is None:
+            raise UpstreamError('No index for financialData was found.')
+
+        financial_glossary_object = data[financial_glossary_index]
+        if not financial_glossary_object:
+            raise UpstreamError('No object existed at financialData index.')
+
+        return {key: data[target_index] for key, target_index in financial_glossary_object.items()}
@@ -1,8 +1,9 @@
 # imports
-from asyncio import CancelledError, TimeoutError, create_task
 from typing import Dict, List, Optional, Any
 
 from src.async_session_manager import AsyncSessionManager
+from src.cache import file_cache
+from src.errors import EmptyResponseError, UpstreamError, ValidationError
 
 
 class RevenueDataController:
@@ -10,30 +11,37 @@ class RevenueDataController:
 
     revenue_base_url = 'https://stockanalysis.com/stocks/{ticker}/revenue/__data.json?x-sveltekit-trailing-slash=1&x-sveltekit-invalidated=001'
 
-    async def get_revenue_data(self, stock_ticker: str) -> Optional[List[Dict[str, Any]]]:
+    # Revenue only changes when a company reports, so it is kept on disk for 90 days
+    cache_ttl = 90 * 24 * 60 * 60
+
+    async def get_revenue_data(self, stock_ticker: str, wrap: bool = True, force_refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
         '''
         Gets revenue data for a stock.
 
         Arguments:
             stock_ticker (str): Stock ticker.
+            wrap (bool): Wrap the data with its data_type, pass False to get the data alone.
+            force_refresh (bool): Request the data even if it is cached.
 
         Returns:
             Optional[List[Dict[str, Any]]]: Cash flow data or None if not found.
         '''
         if not stock_ticker:
-            raise BaseException('No stock ticker provided for cash flow data.')
+            raise ValidationError('No stock ticker provided for cash flow data.')
 
         url = self.build_revenue_url(stock_ticker)
 
-        data = create_task(self.fetch_revenue_data(url))
+        data = await self.fetch_revenue_data(url, force_refresh)
+        if data is None:
+            raise UpstreamError('Revenue data is none.')
+
+        if not wrap:
+            return data
 
-        if data:
-            return {
-                'data_type': 'revenue',
-                'data': await data
-            }
-        else:
-            raise BaseException(f'revenue data is none')
+        return {
+            'data_type': 'revenue',
+            'data': data
+        }
 
     def build_revenue_url(self, ticker: str) -> str:
         '''
@@ -45,35 +53,32 @@ class RevenueDataController:
         Returns:
             str: Constructed URL.
         '''
-        return self.revenue_base_url.replace('{ticker}', ticker)
-
-    def convert_keys_to_labels(self, entry: Dict[str, Any]) -> Dict[str, Any]:
-        '''
-        Relabels keys in a dictionary according to the financial_revenue_keys_to_labels mapping.
-
-        Arguments:
-            entry (Dict[str, Any]): Dictionary of financial data.
-
-        Returns:
-            Dict[str, Any]: Dictionary with relabeled keys.
-        '''
-        return {self.revenue_keys_to_labels.get(key, key): value for key, value in entry.items()}
+        return self.revenue_base_url.format(ticker=ticker)
 
-    async def fetch_revenue_data(self, url: str) -> Optional[List[Dict[str, Any]]]:
+    async def fetch_revenue_data(self, url: str, force_refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
         '''
-        Handles retrieval of revenue data from a URL.
+        Handles retrieval of revenue data from a URL, reusing the copy cached on disk when it has not expired.
 
         Arguments:
             url (str): URL for data.
+            force_refresh (bool): Request the data even if it is cached.
 
         Returns:
             Optional[List[Dict[str, Any]]]: Formatted data or None if not found.
         '''
+        if not force_refresh:
+            cached = file_cache.get('revenue', url)
+            if cached is not None:
+                return cached
+
         response_json = await AsyncSessionManager.request_with_limit(url)
         if not response_json:
-            raise f'No json for revenue data.'
+            raise EmptyResponseError('No json for revenue data.', url=url)
 
-        return self.extract_financial_data(response_json)
+        data = self.extract_financial_data(response_json)
+        file_cache.set('revenue', url, data, self.cache_ttl)
+
+        return data
 
     def extract_financial_data(self, response_json: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
         '''
@@ -85,30 +90,22 @@ class RevenueDataController:
         Returns:
             Optional[List[Dict[str, Any]]]: Extracted financial data or None if not found.
         '''
-        nodes = response_json.get('nodes')
-        if not nodes or len(nodes) < 3:
-            raise BaseException('Target node does not exist.')
-
-        target_node = nodes[2]
-        data = target_node.get('data')
-        if not data:
-            raise BaseException('No data was found in the target node.')
-
-        financial_data_indices = self.get_financial_data_indices(data)
-        if financial_data_indices is None:
-            raise BaseException('Could not find target index node.')
-
-        # financial_data = {
-        #     key: [data[target_index] for target_index in indices] for key, indices in financial_data_indices.items()
-        # }
-        
-        # retrieve values for financial_data values
-        financial_data = {
-            key: [{dict_key: data[target_index] for dict_key, target_index in item.items()} 
-                for item in [data[idx] for idx in indices] if 'limited' not in item.keys()]
-            for key, indices in financial_data_indices.items()
-        }
-            
+        # Index straight into the expected layout and only handle a mismatch when it happens
+        try:
+            data = response_json['nodes'][2]['data']
+            financial_data_indices = self.get_financial_data_indices(data)
+        except (KeyError, IndexError, TypeError) as e:
+            raise UpstreamError('Revenue data was not found in the target node.') from e
+
+        # retrieve values for financial_data values, skipping rows marked 'limited'
+        financial_data = {}
+        for key, indices in financial_data_indices.items():
+            items = [data[idx] for idx in indices]
+            financial_data[key] = [
+                {dict_key: data[target_index] for dict_key, target_index in item.items()}
+                for item in items if 'limited' not in item
+            ]
+
         return financial_data
 
     def get_financial_data_indices(self, data: List[Dict[str, Any]]) -> Optional[Dict[str, List[int]]]:
@@ -123,10 +120,10 @@ class RevenueDataController:
         '''
         financial_glossary_index = data[0].get('data')
         if financial_glossary_index is None:
-            raise BaseException('No index for data was found.')
+            raise UpstreamError('No index for data was found.')
 
         financial_glossary_object = data[financial_glossary_index]
         if not financial_glossary_object:
-            raise BaseException('No object existed at data index.')
+            raise UpstreamError('No object existed at data index.')
 
         return {key: data[target_index] for key, target_index in financial_glossary_object.items()}
@@ -1,26 +1,32 @@
 
 # imports
-from datetime import datetime
-from asyncio import CancelledError, TimeoutError, create_task
+import numpy as np
 
 from src.async_session_manager import AsyncSessionManager
+from src.cache import file_cache
+from src.errors import UpstreamError, ValidationError
 
 
 class TimeSeriesDataController:
     base_url = 'https://api.stockanalysis.com/api/symbol/{asset_type}/{ticker}/history?type=chart'
 
-    valid_asset_types = [
+    # Daily closes, so a day old copy on disk is still current enough
+    cache_ttl = 24 * 60 * 60
+
+    valid_asset_types = frozenset({
         's',  # stock
         'e',  # etf
-    ]
+    })
 
-    async def get_asset_ts_data(self, ticker: str, asset_type: str):
+    async def get_asset_ts_data(self, ticker: str, asset_type: str, wrap: bool = True, force_refresh: bool = False):
         '''
             Gets a list of time-series data with closing prices for an asset.
 
             Arguments:
                 ticker (str) Ticker for asset
                 asset_type (str) Type of asset (e.g., e ('ETF'), s ('Stock'))
+                wrap (bool) Wrap the data with its data_type, pass False to get the data alone
+                force_refresh (bool) Request the data even if it is cached
 
             Returns:
                 time_series_data (List)
@@ -37,23 +43,20 @@ class TimeSeriesDataController:
         )
 
         # get data
-        data = create_task(self.get_ts_data_from_url(url))
-        if not await data:
-            return {
-                'data_type': 'time_series',
-                'data': data
-            }
-        
-        formatted_data = [self.convert_time_series_entry(entry) for entry in await data]
-        
+        data = await self.get_ts_data_from_url(url, force_refresh)
+        if data is None:
+            raise UpstreamError('Time series data is none.')
+
         # format data
-        if data:
-            return {
-                'data_type': 'time_series',
-                'data': formatted_data
-            }
-        else:
-            raise BaseException(f'time series data is none')
+        formatted_data = self.convert_time_series(data)
+
+        if not wrap:
+            return formatted_data
+
+        return {
+            'data_type': 'time_series',
+            'data': formatted_data
+        }
 
     def build_url_from_ticker(self, ticker: str, asset_type: str):
         '''
@@ -68,57 +71,63 @@ class TimeSeriesDataController:
 
         # check args
         if not ticker or not asset_type:
-            raise BaseException(f'Invalid arguments for {__name__}')
+            raise ValidationError(f'Invalid arguments for {__name__}')
 
         # build url
-        url = self.base_url
-        url = url.replace('{ticker}', ticker)
-        url = url.replace('{asset_type}', asset_type)
-
-        return url
+        return self.base_url.format(asset_type=asset_type, ticker=ticker)
 
-    def convert_time_series_entry(self, entry):
+    def convert_time_series(self, entries):
         '''
-            Handles formatting timestamps and float values from time-series list items
+            Handles formatting timestamps and float values from time-series list items.
+            The whole series is converted at once with NumPy instead of row by row.
             
             Arguments:
-                entry (list) 
+                entries (list) [timestamp_ms, closing_price] pairs
                 
             Returns
-                formatted_entry (dict)
+                formatted_entries (list)
         '''
-        
-        # Extract timestamp and closing price
-        timestamp_ms, closing_price = entry
 
-        # Convert milliseconds to seconds
-        timestamp_s = round(timestamp_ms / 1000.0)
-        
-        # Convert to a date string
-        # date = datetime.utcfromtimestamp(timestamp_s).strftime('%Y-%m-%d')
-        
-        date = datetime.fromtimestamp(timestamp_s).strftime('%Y-%m-%d')
+        if not entries:
+            return []
+
+        series = np.asarray(entries, dtype=np.float64)
 
-        # Return a dictionary with the date and closing price
-        return {'date': date, 'closing_price': float(closing_price)}
+        # Convert milliseconds to seconds, then to UTC date strings
+        timestamps_s = np.round(series[:, 0] / 1000.0).astype('datetime64[s]')
+        dates = np.datetime_as_string(timestamps_s, unit='D')
 
-    async def get_ts_data_from_url(self, url):
+        # Return a dictionary with the date and closing price for each entry
+        return [
+            {'date': date, 'closing_price': closing_price}
+            for date, closing_price in zip(dates.tolist(), series[:, 1].tolist())
+        ]
+
+    async def get_ts_data_from_url(self, url, force_refresh: bool = False):
         '''
-            Handles retrieval of time-series data from url.
+            Handles retrieval of time-series data from url, reusing the copy cached on disk when it has not expired.
             
             Arguments:
                 url (str) URL for data
+                force_refresh (bool) Request the data even if it is cached
                 
             Returns:
                 formatted_data (list)
         '''
         
+        if not force_refresh:
+            cached = file_cache.get('time_series', url)
+            if cached is not None:
+                return cached
+
         # get async client for request
         response_json = await AsyncSessionManager.request_with_limit(url)        
         json_data = response_json.get('data', None)
         if not json_data:
             return json_data
 
+        file_cache.set('time_series', url, json_data, self.cache_ttl)
+
         return json_data
          
     def validate_ts_parameters(self, ticker: str, asset_type: str):
@@ -134,10 +143,10 @@ class TimeSeriesDataController:
 
         # check args
         if not ticker or not asset_type:
-            raise BaseException(f'Invalid arguments for {__name__}')
+            raise ValidationError(f'Invalid arguments for {__name__}')
 
         # validate parameters
         if asset_type not in self.valid_asset_types:
-            raise BaseException(f'Asset type parameter value {asset_type} is not valid.')
+            raise ValidationError(f'Asset type parameter value {asset_type} is not valid.')
 
         return True
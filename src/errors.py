@@ -0,0 +1,28 @@
+class ValidationError(ValueError):
+    '''Raised when a request has missing or invalid arguments'''
+
+
+class UpstreamError(RuntimeError):
+    '''Raised when the upstream data source returns an unusable response'''
+
+    def __init__(self, message: str, url: str = None, status: int = None, reason: str = None) -> None:
+        super().__init__(message)
+        self.url = url
+        self.status = status
+        self.reason = reason
+
+
+class UpstreamClientError(UpstreamError):
+    '''Raised for 4xx responses. Retrying the same request will not help.'''
+
+
+class UpstreamServerError(UpstreamError):
+    '''Raised for 5xx responses. The request may succeed if retried later.'''
+
+
+class EmptyResponseError(UpstreamError):
+    '''Raised when the upstream data source answers successfully with no data'''
+
+
+class RateLimitedError(UpstreamError):
+    '''Raised when the upstream data source is still rate limiting (HTTP 429) after all retries'''
@@ -1,15 +1,27 @@
 
 import asyncio
-from asyncio import TimeoutError, CancelledError, create_task
+from asyncio import TimeoutError
+from functools import partial
 
+from src.async_session_manager import AsyncSessionManager
 from src.controllers.data.historical_data_controller import HistoricalDataController
 from src.controllers.data.time_series_data_controller import TimeSeriesDataController
+from src.errors import UpstreamError
 
 
 class ETFDataOrchestrator:
-    def __init__(self, hdc=HistoricalDataController(), tsdc=TimeSeriesDataController()) -> None:
-        self.hdc = hdc
-        self.tsdc = tsdc
+    compose_timeout = 30  # seconds allowed for all data requests, leaves room for rate limit retries
+    # Requests compose_many keeps in flight, so queued ones do not use up their timeout. None matches
+    # the session manager's per-host limit, since every etf request goes to the same host.
+    batch_concurrency = None
+
+    # Keys for the composed data, in the same order the requests are made
+    data_types = ('historical', 'time_series')
+
+    def __init__(self, hdc: HistoricalDataController = None, tsdc: TimeSeriesDataController = None) -> None:
+        # src.container injects the shared controllers, only build them when used standalone
+        self.hdc = hdc or HistoricalDataController()
+        self.tsdc = tsdc or TimeSeriesDataController()
 
     async def compose_etf_data(self, ticker: str):
         '''
@@ -29,29 +41,92 @@ class ETFDataOrchestrator:
             'data': {}
         }
 
-        # Get all data
-        tasks = await asyncio.gather(*[
-            self.hdc.get_asset_historical_data(ticker, 'e', '5Y', 'Daily'),
-            self.tsdc.get_asset_ts_data(ticker, 'e')
-        ])
+        # Get all data, cancelling the remaining requests if one fails or time runs out
+        try:
+            async with asyncio.timeout(self.compose_timeout):
+                async with asyncio.TaskGroup() as tg:
+                    tasks = [tg.create_task(coro) for coro in [
+                        self.hdc.get_asset_historical_data(ticker, 'e', '5Y', 'Daily', wrap=False),
+                        self.tsdc.get_asset_ts_data(ticker, 'e', wrap=False)
+                    ]]
+        except ExceptionGroup as eg:
+            # Surface the first failure so callers see the original error type
+            raise eg.exceptions[0]
+        except TimeoutError as e:
+            raise UpstreamError(f'Timed out composing etf data for {ticker} after {self.compose_timeout} seconds.') from e
 
-        final['data'] = {task_data['data_type']: task_data['data'] for task_data in tasks}
+        final['data'] = dict(zip(self.data_types, (task.result() for task in tasks)))
             
         return final
 
+    async def compose_many(self, tickers: list[str]) -> list[dict]:
+        '''
+            Composes data for many etfs with their requests in flight together, up to batch_concurrency.
+            Each request gets compose_timeout seconds from when it starts. A ticker whose requests
+            fail or time out gets an 'error' message in place of its data.
+
+            Arguments:
+                tickers: list[str]
+            Returns:
+                list[dict]: [{
+                    'ticker': str,
+                    'asset_type': str,
+                    'data': dict,
+                }]
+        '''
+
+        limit = asyncio.Semaphore(self.batch_concurrency or AsyncSessionManager.host_concurrency)
+
+        async def run(request):
+            # The timeout starts once the request is admitted, not while it waits its turn
+            async with limit:
+                try:
+                    return await asyncio.wait_for(request(), self.compose_timeout)
+                except TimeoutError as e:
+                    raise UpstreamError(f'Request timed out after {self.compose_timeout} seconds.') from e
+
+        # One flat batch, in data_types order for each ticker
+        requests = []
+        for ticker in tickers:
+            requests.append(partial(self.hdc.get_asset_historical_data, ticker, 'e', '5Y', 'Daily', wrap=False))
+            requests.append(partial(self.tsdc.get_asset_ts_data, ticker, 'e', wrap=False))
+
+        results = await asyncio.gather(*(run(request) for request in requests), return_exceptions=True)
+
+        composed = []
+        stride = len(self.data_types)
+        for position, ticker in enumerate(tickers):
+            ticker_results = results[position * stride:(position + 1) * stride]
+            final = {
+                'ticker': ticker,
+                'asset_type': 'etf',
+                'data': {}
+            }
+
+            error = next((result for result in ticker_results if isinstance(result, Exception)), None)
+            if error is None:
+                final['data'] = dict(zip(self.data_types, ticker_results))
+            else:
+                final['error'] = str(error)
+
+            composed.append(final)
+
+        return composed
+
     async def prepare_etf_data_tasks(self, ticker: str):
         '''
-        Creates etf task list
+        Runs the etf data requests concurrently
 
         Arguments:
             ticker (str): The etf ticker symbol.
 
         Returns:
-            dict: Composed data for the stock.
+            list: Wrapped historical and time series data, in that order. A failed request
+            leaves its exception in place of its data.
         '''
-        # Concurrently create tasks for each data type with awaited individual tasks
-        historical = self.hdc.get_asset_historical_data(ticker, 'e', '5Y', 'Daily')
-        time_series = self.tsdc.get_asset_ts_data(ticker, 'e')
-
-        # Return all gathered data as a dictionary
-        return [historical, time_series]
+        # gather schedules both requests right away so they overlap instead of running in turn
+        return await asyncio.gather(
+            self.hdc.get_asset_historical_data(ticker, 'e', '5Y', 'Daily'),
+            self.tsdc.get_asset_ts_data(ticker, 'e'),
+            return_exceptions=True
+        )
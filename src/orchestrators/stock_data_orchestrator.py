@@ -1,11 +1,9 @@
 import asyncio
-from asyncio import TimeoutError, CancelledError, create_task
-from aiohttp import ClientResponseError
-
-from typing import Dict, List, Any
+from asyncio import TimeoutError
 
 from src.controllers.data.historical_data_controller import HistoricalDataController
 from src.controllers.data.time_series_data_controller import TimeSeriesDataController
+from src.errors import UpstreamError
 
 from src.controllers.data.stocks.financials.balance_sheet_data_controller import BalanceSheetDataController
 from src.controllers.data.stocks.financials.cash_flow_data_controller import CashFlowDataController
@@ -16,22 +14,28 @@ from src.controllers.data.stocks.statistics.revenue_data_controller import Reven
 
 
 class StockDataOrchestrator:
+    compose_timeout = 30  # seconds allowed for all data requests, leaves room for rate limit retries
+
+    # Keys for the composed data, in the same order the requests are made
+    data_types = ('historical', 'time_series', 'balance_sheet', 'cash_flow', 'income', 'ratios', 'revenue')
+
     def __init__(self,
-                 bsdc=BalanceSheetDataController(),
-                 cdc=CashFlowDataController(),
-                 idc = IncomeDataController(),
-                 hdc=HistoricalDataController(),
-                 ratios_dc=RatiosDataController(),
-                 revenue_dc=RevenueDataController(),
-                 tsdc=TimeSeriesDataController(),
+                 bsdc: BalanceSheetDataController = None,
+                 cdc: CashFlowDataController = None,
+                 idc: IncomeDataController = None,
+                 hdc: HistoricalDataController = None,
+                 ratios_dc: RatiosDataController = None,
+                 revenue_dc: RevenueDataController = None,
+                 tsdc: TimeSeriesDataController = None,
                  ) -> None:
-        self.bsdc = bsdc
-        self.cdc = cdc
-        self.hdc = hdc
-        self.ratios_dc = ratios_dc
-        self.revenue_dc = revenue_dc
-        self.tsdc = tsdc
-        self.idc = idc
+        # src.container injects the shared controllers, only build them when used standalone
+        self.bsdc = bsdc or BalanceSheetDataController()
+        self.cdc = cdc or CashFlowDataController()
+        self.hdc = hdc or HistoricalDataController()
+        self.ratios_dc = ratios_dc or RatiosDataController()
+        self.revenue_dc = revenue_dc or RevenueDataController()
+        self.tsdc = tsdc or TimeSeriesDataController()
+        self.idc = idc or IncomeDataController()
 
     async def compose_stock_data(self, ticker: str):
         '''
@@ -53,18 +57,26 @@ class StockDataOrchestrator:
             'data': {}
         }
 
-        # Get all data
-        tasks = await asyncio.gather(*[
-            self.hdc.get_asset_historical_data(ticker, 's', '5Y', 'Daily'),
-            self.tsdc.get_asset_ts_data(ticker, 's'),
-            self.bsdc.get_balance_sheet_data(ticker),
-            self.cdc.get_cash_flow_data(ticker),
-            self.idc.get_income_data(ticker, 'quarterly'),
-            self.ratios_dc.get_ratios_data(ticker),
-            self.revenue_dc.get_revenue_data(ticker)
-        ])
-
-        final['data'] = {task_data['data_type']: task_data['data'] for task_data in tasks}
+        # Get all data, cancelling the remaining requests if one fails or time runs out
+        try:
+            async with asyncio.timeout(self.compose_timeout):
+                async with asyncio.TaskGroup() as tg:
+                    tasks = [tg.create_task(coro) for coro in [
+                        self.hdc.get_asset_historical_data(ticker, 's', '5Y', 'Daily', wrap=False),
+                        self.tsdc.get_asset_ts_data(ticker, 's', wrap=False),
+                        self.bsdc.get_balance_sheet_data(ticker, wrap=False),
+                        self.cdc.get_cash_flow_data(ticker, wrap=False),
+                        self.idc.get_income_data(ticker, 'quarterly', wrap=False),
+                        self.ratios_dc.get_ratios_data(ticker, wrap=False),
+                        self.revenue_dc.get_revenue_data(ticker, wrap=False)
+                    ]]
+        except ExceptionGroup as eg:
+            # Surface the first failure so callers see the original error type
+            raise eg.exceptions[0]
+        except TimeoutError as e:
+            raise UpstreamError(f'Timed out composing stock data for {ticker} after {self.compose_timeout} seconds.') from e
+
+        final['data'] = dict(zip(self.data_types, (task.result() for task in tasks)))
             
         return final
 
@@ -84,7 +96,7 @@ class StockDataOrchestrator:
         time_series = self.tsdc.get_asset_ts_data(ticker, 's')
         balance_sheet = self.bsdc.get_balance_sheet_data(ticker)
         cash_flow = self.cdc.get_cash_flow_data(ticker)
-        ratios = self.rdc.get_ratios_data(ticker)
+        ratios = self.ratios_dc.get_ratios_data(ticker)
 
         # Return all gathered data as a dictionary
         return [historical, time_series, balance_sheet, cash_flow, ratios]
@@ -0,0 +1,141 @@
+import asyncio
+import unittest
+
+import httpx
+
+from src.async_session_manager import AsyncSessionManager
+from src.cache.response_cache import upstream_cache
+from src.errors import UpstreamServerError
+
+
+class RequestCoalescingTest(unittest.IsolatedAsyncioTestCase):
+    url = 'https://api.stockanalysis.com/api/quotes/e/SPY'
+
+    async def asyncSetUp(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+        async def handler(request):
+            self.calls += 1
+            await self.release.wait()
+            return httpx.Response(200, json={'data': {'p': 1}})
+
+        AsyncSessionManager._inflight.clear()
+        AsyncSessionManager._semaphores.clear()
+        AsyncSessionManager._session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def asyncTearDown(self):
+        await AsyncSessionManager.close_session()
+
+    async def test_cancelled_owner_does_not_cancel_waiters(self):
+        owner = asyncio.create_task(AsyncSessionManager.request_with_limit(self.url))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(AsyncSessionManager.request_with_limit(self.url))
+        await asyncio.sleep(0)
+
+        owner.cancel()
+        await asyncio.sleep(0)
+        self.release.set()
+
+        self.assertEqual(await waiter, {'data': {'p': 1}})
+        self.assertTrue(owner.cancelled())
+        self.assertEqual(self.calls, 1)
+
+
+class RetryCancellationTest(unittest.IsolatedAsyncioTestCase):
+    url = 'https://api.stockanalysis.com/api/quotes/e/SPY'
+
+    async def asyncSetUp(self):
+        self.calls = 0
+
+        def handler(request):
+            self.calls += 1
+            return httpx.Response(429)
+
+        AsyncSessionManager._inflight.clear()
+        AsyncSessionManager._semaphores.clear()
+        AsyncSessionManager._session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def asyncTearDown(self):
+        await AsyncSessionManager.close_session()
+
+    async def test_cancelled_lone_caller_stops_retries(self):
+        caller = asyncio.create_task(AsyncSessionManager.request_with_limit(self.url, base_delay=0.05))
+        while not self.calls:
+            await asyncio.sleep(0.01)
+
+        caller.cancel()
+        await asyncio.sleep(0.5)
+
+        self.assertTrue(caller.cancelled())
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(AsyncSessionManager._inflight, {})
+
+    async def test_close_session_cancels_requests_in_flight(self):
+        caller = asyncio.create_task(AsyncSessionManager.request_with_limit(self.url, base_delay=0.05))
+        while not self.calls:
+            await asyncio.sleep(0.01)
+
+        await AsyncSessionManager.close_session()
+        await asyncio.sleep(0.5)
+
+        self.assertEqual(self.calls, 1)
+        self.assertIsNone(AsyncSessionManager._session)
+        with self.assertRaises(asyncio.CancelledError):
+            await caller
+
+
+class TransportErrorTest(unittest.IsolatedAsyncioTestCase):
+    url = 'https://api.stockanalysis.com/api/quotes/e/SPY'
+
+    async def asyncSetUp(self):
+        def handler(request):
+            raise httpx.ReadTimeout('timed out', request=request)
+
+        AsyncSessionManager._inflight.clear()
+        AsyncSessionManager._semaphores.clear()
+        AsyncSessionManager._session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def asyncTearDown(self):
+        await AsyncSessionManager.close_session()
+
+    async def test_transport_errors_are_upstream_errors(self):
+        with self.assertRaises(UpstreamServerError) as raised:
+            await AsyncSessionManager.request_with_limit(self.url)
+
+        self.assertEqual(raised.exception.url, self.url)
+        self.assertIsInstance(raised.exception.__cause__, httpx.ReadTimeout)
+
+
+class InvalidJSONTest(unittest.IsolatedAsyncioTestCase):
+    url = 'https://api.stockanalysis.com/api/quotes/e/SPY'
+
+    async def asyncSetUp(self):
+        self.calls = 0
+
+        def handler(request):
+            self.calls += 1
+            return httpx.Response(200, text='<html>Just a moment...</html>')
+
+        upstream_cache.clear()
+        AsyncSessionManager._inflight.clear()
+        AsyncSessionManager._semaphores.clear()
+        AsyncSessionManager._session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def asyncTearDown(self):
+        upstream_cache.clear()
+        await AsyncSessionManager.close_session()
+
+    async def test_invalid_json_is_an_upstream_error_and_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(UpstreamServerError) as raised:
+                await AsyncSessionManager.request_with_limit(self.url, cache_expire=60)
+
+            self.assertEqual(raised.exception.url, self.url)
+
+        self.assertEqual(self.calls, 2)
+        self.assertIsNone(upstream_cache.get(self.url))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import asyncio
+import unittest
+
+import httpx
+
+from src.async_session_manager import AsyncSessionManager
+from src.orchestrators.etf_data_orchestrator import ETFDataOrchestrator
+
+HOST = 'https://api.stockanalysis.com/api/symbol/e'
+
+
+class StubHistoricalDataController:
+    async def get_asset_historical_data(self, ticker, asset_type, range, period, wrap=True):
+        return await AsyncSessionManager.request_with_limit(f'{HOST}/{ticker}/history?range={range}')
+
+
+class StubTimeSeriesDataController:
+    async def get_asset_ts_data(self, ticker, asset_type, wrap=True):
+        return await AsyncSessionManager.request_with_limit(f'{HOST}/{ticker}/history?type=chart')
+
+
+class ComposeManyTest(unittest.IsolatedAsyncioTestCase):
+    reply_delay = 0.6
+
+    async def asyncSetUp(self):
+        async def handler(request):
+            await asyncio.sleep(10 if '/SLOW/' in request.url.path else self.reply_delay)
+            return httpx.Response(200, json=[request.url.path])
+
+        self.host_concurrency = AsyncSessionManager.host_concurrency
+        AsyncSessionManager.host_concurrency = 8
+        AsyncSessionManager._inflight.clear()
+        AsyncSessionManager._semaphores.clear()
+        AsyncSessionManager._session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        self.orchestrator = ETFDataOrchestrator(hdc=StubHistoricalDataController(), tsdc=StubTimeSeriesDataController())
+        self.orchestrator.compose_timeout = 1.0
+
+    async def asyncTearDown(self):
+        AsyncSessionManager.host_concurrency = self.host_concurrency
+        await AsyncSessionManager.close_session()
+
+    async def test_queued_requests_do_not_time_out(self):
+        # 16 requests at 8 per host take two rounds, longer than one compose_timeout
+        tickers = [f'T{number}' for number in range(8)]
+
+        composed = await self.orchestrator.compose_many(tickers)
+
+        self.assertEqual([final['ticker'] for final in composed], tickers)
+        for final in composed:
+            self.assertNotIn('error', final)
+            self.assertEqual(set(final['data']), {'historical', 'time_series'})
+
+    async def test_slow_ticker_only_fails_itself(self):
+        composed = await self.orchestrator.compose_many(['A', 'SLOW', 'B'])
+
+        self.assertNotIn('error', composed[0])
+        self.assertIn('timed out', composed[1]['error'])
+        self.assertEqual(composed[1]['data'], {})
+        self.assertNotIn('error', composed[2])
+
+
+if __name__ == '__main__':
+    unittest.main()